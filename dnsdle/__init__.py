@@ -31,9 +31,10 @@ def build_startup_state(argv=None):
     client_filename = generation_result["filename"]
     client_bytes = encode_ascii(generation_result["source"])
 
-    payload_sources = read_payload_sources(config)
-    all_sources = payload_sources + [(client_filename, client_bytes)]
-    prepared = prepare_publish_sources(all_sources, config.compression_level)
+    prepared = prepare_publish_sources(
+        read_payload_sources(config) + [(client_filename, client_bytes)],
+        config.compression_level,
+    )
 
     query_token_len = 4
     for _iteration in range(10):
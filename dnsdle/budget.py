@@ -113,14 +113,11 @@ def compute_max_ciphertext_slice_bytes(config, query_token_len=1):
         "query_token_len": query_token_len,
     }
     if logger_enabled("debug"):
-        log_event(
-            "debug",
-            "budget",
-            {
-                "phase": "budget",
-                "classification": "diagnostic",
-                "reason_code": "budget_computed",
-            },
-            context_fn=lambda: dict(budget_info, max_ciphertext_slice_bytes=max_ciphertext_slice_bytes),
-        )
+        log_event("debug", "budget", dict(
+            budget_info,
+            phase="budget",
+            classification="diagnostic",
+            reason_code="budget_computed",
+            max_ciphertext_slice_bytes=max_ciphertext_slice_bytes,
+        ))
     return max_ciphertext_slice_bytes, budget_info
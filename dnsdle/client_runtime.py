@@ -11,7 +11,7 @@ from dnsdle.compat import (
     constant_time_equals,
 )
 from dnsdle.helpers import (
-    hmac_sha256, dns_name_wire_length,
+    hmac_sha256_signer, dns_name_wire_length,
     _derive_file_id, _derive_file_tag, _derive_slice_token,
 )
 from dnsdle.dnswire import _decode_name
@@ -101,9 +101,9 @@ def _parse_response_for_cname(message, expected_id, expected_qname_labels):
     if len(message) < DNS_HEADER_BYTES:
         raise ClientError(EXIT_PARSE, "parse", "response shorter than DNS header")
 
-    response_id, flags, qdcount, ancount = struct.unpack(
-        "!HHHH", message[:8]
-    )
+    # Convert once so every _decode_name call below indexes without copying.
+    message = bytearray(message)
+    response_id, flags, qdcount, ancount = struct.unpack_from("!HHHH", message, 0)
     if response_id != (int(expected_id) & 0xFFFF):
         raise ClientError(EXIT_PARSE, "parse", "response ID mismatch")
     if (flags & DNS_FLAG_QR) == 0:
@@ -123,11 +123,10 @@ def _parse_response_for_cname(message, expected_id, expected_qname_labels):
     qname_labels, offset = _decode_name(message, offset)
     if offset + 4 > len(message):
         raise ClientError(EXIT_PARSE, "parse", "truncated response question")
-    qtype, qclass = struct.unpack("!HH", message[offset:offset + 4])
+    qtype, qclass = struct.unpack_from("!HH", message, offset)
     offset += 4
 
-    expected_qname = tuple(expected_qname_labels)
-    if qname_labels != expected_qname:
+    if qname_labels != expected_qname_labels:
         raise ClientError(EXIT_PARSE, "parse", "response question name mismatch")
     if qtype != DNS_QTYPE_A or qclass != DNS_QCLASS_IN:
         raise ClientError(EXIT_PARSE, "parse", "response question type/class mismatch")
@@ -137,15 +136,15 @@ def _parse_response_for_cname(message, expected_id, expected_qname_labels):
         rr_name, offset = _decode_name(message, offset)
         if offset + 10 > len(message):
             raise ClientError(EXIT_PARSE, "parse", "truncated answer RR header")
-        rr_type, rr_class, _rr_ttl, rdlength = struct.unpack(
-            "!HHIH", message[offset:offset + 10]
+        rr_type, rr_class, _rr_ttl, rdlength = struct.unpack_from(
+            "!HHIH", message, offset
         )
         offset += 10
         rdata_offset = offset
         offset += rdlength
         if offset > len(message):
             raise ClientError(EXIT_PARSE, "parse", "truncated answer RDATA")
-        if rr_type == DNS_QTYPE_CNAME and rr_class == DNS_QCLASS_IN and rr_name == expected_qname:
+        if rr_type == DNS_QTYPE_CNAME and rr_class == DNS_QCLASS_IN and rr_name == expected_qname_labels:
             if cname_labels is not None:
                 raise ClientError(EXIT_PARSE, "parse", "multiple matching CNAME answers")
             parsed_labels, parsed_end = _decode_name(message, rdata_offset)
@@ -160,10 +159,10 @@ def _parse_response_for_cname(message, expected_id, expected_qname_labels):
 
 
 def _extract_payload_text(cname_labels, selected_domain_labels, response_label, dns_max_label_len):
-    suffix = (response_label,) + tuple(selected_domain_labels)
+    suffix = (response_label,) + selected_domain_labels
     if len(cname_labels) <= len(suffix):
         raise ClientError(EXIT_PARSE, "parse", "CNAME target too short")
-    if tuple(cname_labels[-len(suffix):]) != suffix:
+    if cname_labels[-len(suffix):] != suffix:
         raise ClientError(EXIT_PARSE, "parse", "CNAME target suffix mismatch")
 
     payload_labels = cname_labels[:-len(suffix)]
@@ -178,7 +177,7 @@ def _extract_payload_text(cname_labels, selected_domain_labels, response_label,
     return "".join(payload_labels)
 
 
-def _process_slice(enc_key_bytes, mac_key_bytes, file_id, publish_version, slice_index, total_slices, compressed_size, payload_text):
+def _process_slice(enc_sign, mac_sign, file_id, publish_version, slice_index, total_slices, compressed_size, payload_text):
     record = bytearray(base32_decode_no_pad(payload_text))
     if len(record) < 12:
         raise ClientError(EXIT_PARSE, "parse", "slice record is too short")
@@ -188,7 +187,7 @@ def _process_slice(enc_key_bytes, mac_key_bytes, file_id, publish_version, slice
     if record[1] != PAYLOAD_FLAGS_V1_BYTE:
         raise ClientError(EXIT_PARSE, "parse", "unsupported payload flags")
 
-    cipher_len = struct.unpack("!H", record[2:4])[0]
+    cipher_len = struct.unpack_from("!H", record, 2)[0]
     if cipher_len <= 0:
         raise ClientError(EXIT_PARSE, "parse", "cipher_len must be positive")
     if len(record) != 4 + cipher_len + PAYLOAD_MAC_TRUNC_LEN:
@@ -197,7 +196,7 @@ def _process_slice(enc_key_bytes, mac_key_bytes, file_id, publish_version, slice
     ciphertext = bytes(record[4:4 + cipher_len])
     mac = bytes(record[4 + cipher_len:])
 
-    expected = hmac_sha256(mac_key_bytes, (
+    expected = mac_sign(
         PAYLOAD_MAC_MESSAGE_LABEL
         + encode_ascii(file_id) + b"|"
         + encode_ascii(publish_version) + b"|"
@@ -205,11 +204,11 @@ def _process_slice(enc_key_bytes, mac_key_bytes, file_id, publish_version, slice
         + encode_ascii_int(total_slices, "total_slices") + b"|"
         + encode_ascii_int(compressed_size, "compressed_size") + b"|"
         + ciphertext
-    ))[:PAYLOAD_MAC_TRUNC_LEN]
+    )[:PAYLOAD_MAC_TRUNC_LEN]
     if not constant_time_equals(expected, mac):
         raise ClientError(EXIT_CRYPTO, "crypto", "MAC verification failed")
 
-    stream = _keystream_bytes(enc_key_bytes, file_id, publish_version, slice_index, cipher_len)
+    stream = _keystream_bytes(enc_sign, file_id, publish_version, slice_index, cipher_len)
     return _xor_bytes(ciphertext, stream)
 
 
@@ -430,9 +429,9 @@ def _validate_cli_params(base_domains, file_tag, mapping_seed, token_len, total_
 def _download_slices(psk_value, file_id, file_tag, publish_version, total_slices, compressed_size, mapping_seed, token_len, resolver_addr, request_timeout, no_progress_timeout, max_rounds, query_interval_ms, domain_labels_by_domain, base_domains, response_label, dns_max_label_len, dns_edns_size):
     missing = set(range(total_slices))
     stored = {}
-    seed_bytes = encode_ascii(mapping_seed)
-    enc_key_bytes = _derive_file_bound_key(psk_value, file_id, publish_version, PAYLOAD_ENC_KEY_LABEL)
-    mac_key_bytes = _derive_file_bound_key(psk_value, file_id, publish_version, PAYLOAD_MAC_KEY_LABEL)
+    seed_sign = hmac_sha256_signer(encode_ascii(mapping_seed))
+    enc_sign = hmac_sha256_signer(_derive_file_bound_key(psk_value, file_id, publish_version, PAYLOAD_ENC_KEY_LABEL))
+    mac_sign = hmac_sha256_signer(_derive_file_bound_key(psk_value, file_id, publish_version, PAYLOAD_MAC_KEY_LABEL))
 
     query_interval_sec = float(query_interval_ms) / 1000.0
 
@@ -452,7 +451,7 @@ def _download_slices(psk_value, file_id, file_tag, publish_version, total_slices
                 raise ClientError(EXIT_TRANSPORT, "dns", "no-progress timeout")
 
             domain_labels = domain_labels_by_domain[domain_index]
-            slice_token = _derive_slice_token(seed_bytes, publish_version, slice_index, token_len)
+            slice_token = _derive_slice_token(seed_sign, publish_version, slice_index, token_len)
             qname_labels = (slice_token, file_tag) + domain_labels
             query_id = random.randint(0, 0xFFFF)
             query_packet = _build_dns_query(query_id, qname_labels, dns_edns_size)
@@ -478,7 +477,7 @@ def _download_slices(psk_value, file_id, file_tag, publish_version, total_slices
             consecutive_timeouts = 0
             payload_text = _extract_payload_text(cname_labels, domain_labels, response_label, dns_max_label_len)
             slice_plain = _process_slice(
-                enc_key_bytes, mac_key_bytes, file_id, publish_version,
+                enc_sign, mac_sign, file_id, publish_version,
                 slice_index, total_slices, compressed_size, payload_text,
             )
 
@@ -552,7 +551,7 @@ def _parse_runtime_args(argv):
     dns_edns_size = _parse_int(args.dns_edns_size, "--dns-edns-size", 1)
 
     file_id = _derive_file_id(publish_version)
-    file_tag = _derive_file_tag(encode_ascii(mapping_seed), publish_version, file_tag_len)
+    file_tag = _derive_file_tag(hmac_sha256_signer(encode_ascii(mapping_seed)), publish_version, file_tag_len)
 
     timeout_seconds = _parse_positive_float(args.timeout, "--timeout")
     no_progress_timeout = _parse_positive_float(
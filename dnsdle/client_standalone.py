@@ -16,7 +16,8 @@ _EXTRACTIONS = [
         "is_binary",
     ]),
     ("helpers.py", [
-        "hmac_sha256", "dns_name_wire_length", "_derive_file_id",
+        "hmac_sha256", "hmac_sha256_signer", "dns_name_wire_length",
+        "_derive_file_id",
         "_derive_file_tag", "_derive_slice_token",
     ]),
     ("dnswire.py", ["_decode_name"]),
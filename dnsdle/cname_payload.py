@@ -14,6 +14,7 @@ from dnsdle.constants import PAYLOAD_MAC_MESSAGE_LABEL
 from dnsdle.constants import PAYLOAD_MAC_TRUNC_LEN
 from dnsdle.constants import PAYLOAD_PROFILE_V1_BYTE
 from dnsdle.helpers import hmac_sha256
+from dnsdle.helpers import hmac_sha256_signer
 
 
 def _split_payload_labels(payload_text, label_cap):
@@ -43,7 +44,7 @@ def _derive_file_bound_key(psk, file_id, publish_version, key_label):
 
 
 # __EXTRACT: _keystream_bytes__
-def _keystream_bytes(enc_key, file_id, publish_version, slice_index, output_len):
+def _keystream_bytes(enc_sign, file_id, publish_version, slice_index, output_len):
     if output_len <= 0:
         raise ValueError("output_len must be positive")
     file_id_bytes = encode_ascii(file_id)
@@ -64,7 +65,7 @@ def _keystream_bytes(enc_key, file_id, publish_version, slice_index, output_len)
             + b"|"
             + counter_bytes
         )
-        block = hmac_sha256(enc_key, block_input)
+        block = enc_sign(block_input)
         blocks.append(block)
         produced += len(block)
         counter += 1
@@ -81,12 +82,22 @@ def _xor_bytes(left_bytes, right_bytes):
 # __END_EXTRACT__
 
 
-def _encrypt_slice_bytes(psk, file_id, publish_version, slice_index, slice_bytes):
+def file_bound_signers(psk, file_id, publish_version):
+    return (
+        hmac_sha256_signer(
+            _derive_file_bound_key(psk, file_id, publish_version, PAYLOAD_ENC_KEY_LABEL)
+        ),
+        hmac_sha256_signer(
+            _derive_file_bound_key(psk, file_id, publish_version, PAYLOAD_MAC_KEY_LABEL)
+        ),
+    )
+
+
+def _encrypt_slice_bytes(enc_sign, file_id, publish_version, slice_index, slice_bytes):
     if not slice_bytes:
         raise ValueError("slice_bytes must be non-empty")
-    key = _derive_file_bound_key(psk, file_id, publish_version, PAYLOAD_ENC_KEY_LABEL)
     stream = _keystream_bytes(
-        key,
+        enc_sign,
         file_id,
         publish_version,
         slice_index,
@@ -96,7 +107,7 @@ def _encrypt_slice_bytes(psk, file_id, publish_version, slice_index, slice_bytes
 
 
 def _mac_bytes(
-    psk,
+    mac_sign,
     file_id,
     publish_version,
     slice_index,
@@ -125,17 +136,12 @@ def _mac_bytes(
         + b"|"
         + ciphertext_bytes
     )
-    mac_key = _derive_file_bound_key(
-        psk,
-        file_id,
-        publish_version,
-        PAYLOAD_MAC_KEY_LABEL,
-    )
-    return hmac_sha256(mac_key, message)[:PAYLOAD_MAC_TRUNC_LEN]
+    return mac_sign(message)[:PAYLOAD_MAC_TRUNC_LEN]
 
 
 def build_slice_record(
-    psk,
+    enc_sign,
+    mac_sign,
     file_id,
     publish_version,
     slice_index,
@@ -157,7 +163,7 @@ def build_slice_record(
     if slice_index_int < 0 or slice_index_int >= total_slices_int:
         raise ValueError("slice_index must be within total_slices")
     ciphertext = _encrypt_slice_bytes(
-        psk,
+        enc_sign,
         file_id,
         publish_version,
         slice_index_int,
@@ -166,7 +172,7 @@ def build_slice_record(
 
     header = struct.pack("!BBH", PAYLOAD_PROFILE_V1_BYTE, PAYLOAD_FLAGS_V1_BYTE, len(slice_bytes))
     mac = _mac_bytes(
-        psk,
+        mac_sign,
         file_id,
         publish_version,
         slice_index_int,
@@ -178,7 +184,8 @@ def build_slice_record(
 
 
 def payload_labels_for_slice(
-    psk,
+    enc_sign,
+    mac_sign,
     file_id,
     publish_version,
     slice_index,
@@ -188,7 +195,8 @@ def payload_labels_for_slice(
     label_cap,
 ):
     record_bytes = build_slice_record(
-        psk,
+        enc_sign,
+        mac_sign,
         file_id,
         publish_version,
         slice_index,
@@ -12,7 +12,6 @@ from dnsdle.constants import MAX_DNS_EDNS_SIZE
 from dnsdle.constants import MIN_DNS_EDNS_SIZE
 from dnsdle.constants import TOKEN_ALPHABET_CHARS
 from dnsdle.helpers import dns_name_wire_length
-from dnsdle.helpers import labels_is_suffix
 from dnsdle.state import StartupError
 
 
@@ -25,6 +24,8 @@ Config = namedtuple(
     [
         "domains",
         "domain_labels_by_domain",
+        "domain_by_labels",
+        "domain_label_counts",
         "longest_domain",
         "longest_domain_labels",
         "longest_domain_wire_len",
@@ -54,8 +55,7 @@ def _normalize_domain(value):
     if value is None:
         raise StartupError("config", "invalid_config", "domain is required")
 
-    domain = value.strip().lower()
-    domain = domain.rstrip(".")
+    domain = value.strip().lower().rstrip(".")
 
     if not domain:
         raise StartupError("config", "invalid_config", "domain is empty")
@@ -110,18 +110,20 @@ def _normalize_domains(raw_value):
 
     domain_labels_by_domain = tuple(normalized[domain] for domain in domains)
 
-    for index in range(len(domains)):
-        labels_a = domain_labels_by_domain[index]
-        for other_index in range(index + 1, len(domains)):
-            labels_b = domain_labels_by_domain[other_index]
-            if labels_is_suffix(labels_a, labels_b) or labels_is_suffix(labels_b, labels_a):
+    domain_by_labels = dict(zip(domain_labels_by_domain, domains))
+    for domain, labels in zip(domains, domain_labels_by_domain):
+        for start in range(1, len(labels)):
+            other_domain = domain_by_labels.get(labels[start:])
+            if other_domain is not None:
                 raise StartupError(
                     "config",
                     "overlapping_domains",
                     "configured domains overlap on label boundaries",
-                    {"domain": domains[index], "other_domain": domains[other_index]},
+                    {"domain": other_domain, "other_domain": domain},
                 )
 
+    domain_label_counts = tuple(sorted(set(len(labels) for labels in domain_labels_by_domain)))
+
     longest_idx = max(range(len(domains)),
                       key=lambda i: dns_name_wire_length(domain_labels_by_domain[i]))
     longest_domain = domains[longest_idx]
@@ -131,6 +133,8 @@ def _normalize_domains(raw_value):
     return (
         domains,
         domain_labels_by_domain,
+        domain_by_labels,
+        domain_label_counts,
         longest_domain,
         longest_domain_labels,
         longest_domain_wire_len,
@@ -183,14 +187,12 @@ def _normalize_files(raw_value):
     if raw_value is None:
         raise StartupError("config", "invalid_config", "files is required")
 
-    values = [p.strip() for p in raw_value.split(",") if p.strip()]
-
-    if not values:
-        raise StartupError("config", "invalid_config", "files list is empty")
-
     normalized = []
     seen = set()
-    for path in values:
+    for raw_path in raw_value.split(","):
+        path = raw_path.strip()
+        if not path:
+            continue
         canonical = os.path.abspath(os.path.normpath(path))
         if canonical in seen:
             raise StartupError(
@@ -216,6 +218,9 @@ def _normalize_files(raw_value):
             )
         normalized.append(canonical)
 
+    if not normalized:
+        raise StartupError("config", "invalid_config", "files list is empty")
+
     return tuple(normalized)
 
 
@@ -279,6 +284,8 @@ def build_config(parsed_args):
     (
         domains,
         domain_labels_by_domain,
+        domain_by_labels,
+        domain_label_counts,
         longest_domain,
         longest_domain_labels,
         longest_domain_wire_len,
@@ -352,6 +359,8 @@ def build_config(parsed_args):
     return Config(
         domains=domains,
         domain_labels_by_domain=domain_labels_by_domain,
+        domain_by_labels=domain_by_labels,
+        domain_label_counts=domain_label_counts,
         longest_domain=longest_domain,
         longest_domain_labels=longest_domain_labels,
         longest_domain_wire_len=longest_domain_wire_len,
@@ -88,5 +88,7 @@ LOG_LEVELS = ("error", "warn", "info", "debug", "trace")
 LOG_CATEGORIES = ("startup", "config", "budget", "publish", "mapping", "dnswire", "server")
 DEFAULT_LOG_LEVEL = "info"
 DEFAULT_LOG_FILE = ""
+LOG_FLUSH_INTERVAL_MS = 500
+LOG_FILE_BUFFER_BYTES = 65536
 
 REQUIRED_LIFECYCLE_CLASSIFICATIONS = ("server_start", "shutdown")
@@ -2,7 +2,6 @@ from __future__ import absolute_import, unicode_literals
 
 import struct
 
-from dnsdle.compat import decode_ascii
 from dnsdle.compat import encode_ascii
 from dnsdle.constants import DNS_HEADER_BYTES
 from dnsdle.constants import DNS_FLAG_AA
@@ -21,11 +20,25 @@ from dnsdle.logging_runtime import log_event
 from dnsdle.logging_runtime import logger_enabled
 
 
+_HEADER = struct.Struct("!HHHHHH")
+_TYPE_CLASS = struct.Struct("!HH")
+_TTL_RDLENGTH = struct.Struct("!IH")
+_U16 = struct.Struct("!H")
+_U32 = struct.Struct("!I")
+
+# Response pieces that never vary; only TTL, lengths and EDNS size are packed per call.
+_QUESTION_POINTER = _U16.pack(DNS_POINTER_MASK | DNS_HEADER_BYTES)
+_CNAME_TYPE_CLASS = _TYPE_CLASS.pack(DNS_QTYPE_CNAME, DNS_QCLASS_IN)
+_A_ANSWER_PREFIX = _QUESTION_POINTER + _TYPE_CLASS.pack(DNS_QTYPE_A, DNS_QCLASS_IN)
+_A_ANSWER_SUFFIX = _U16.pack(len(SYNTHETIC_A_RDATA)) + SYNTHETIC_A_RDATA
+_OPT_PREFIX = b"\x00" + _U16.pack(DNS_QTYPE_OPT)
+_OPT_SUFFIX = _TTL_RDLENGTH.pack(0, 0)
+
+
 class DnsParseError(Exception):
     pass
 
 
-
 def _to_label_bytes(label):
     raw = encode_ascii(label)
     if not raw:
@@ -36,24 +49,23 @@ def _to_label_bytes(label):
 
 
 def encode_name(labels):
-    parts = []
+    buf = bytearray()
     for label in labels:
         raw = _to_label_bytes(label)
-        parts.append(struct.pack("!B", len(raw)))
-        parts.append(raw)
-    parts.append(b"\x00")
-    return b"".join(parts)
+        buf.append(len(raw))
+        buf += raw
+    buf.append(0)
+    return bytes(buf)
 
 
 # __EXTRACT: _decode_name__
 def _decode_name(message, start_offset):
-    ba = bytearray(message)
+    ba = message if isinstance(message, bytearray) else bytearray(message)
     message_len = len(ba)
     labels = []
     offset = start_offset
-    jumped = False
     read_end_offset = None
-    visited_offsets = set()
+    pointer_limit = start_offset
 
     while True:
         if offset >= message_len:
@@ -64,14 +76,11 @@ def _decode_name(message, start_offset):
             if offset + 1 >= message_len:
                 raise DnsParseError("truncated name pointer")
             pointer = ((first & 0x3F) << 8) | ba[offset + 1]
-            if pointer >= message_len:
-                raise DnsParseError("name pointer is out of bounds")
-            if pointer in visited_offsets:
-                raise DnsParseError("name pointer loop detected")
-            visited_offsets.add(pointer)
-            if not jumped:
+            if pointer >= pointer_limit:
+                raise DnsParseError("name pointer does not point backward")
+            pointer_limit = pointer
+            if read_end_offset is None:
                 read_end_offset = offset + 2
-                jumped = True
             offset = pointer
             continue
 
@@ -85,10 +94,9 @@ def _decode_name(message, start_offset):
         end_offset = offset + first
         if end_offset > message_len:
             raise DnsParseError("label extends past message")
-        raw = bytes(ba[offset:end_offset])
         try:
-            label = decode_ascii(raw)
-        except Exception:
+            label = ba[offset:end_offset].decode("ascii")
+        except UnicodeDecodeError:
             raise DnsParseError("label is not ASCII")
         labels.append(label.lower())
         offset = end_offset
@@ -96,19 +104,19 @@ def _decode_name(message, start_offset):
         if len(labels) > 127:
             raise DnsParseError("name has too many labels")
 
-    return tuple(labels), (read_end_offset if jumped else offset)
+    return tuple(labels), (offset if read_end_offset is None else read_end_offset)
 # __END_EXTRACT__
 
 
 def _unpack_header(message):
-    return struct.unpack("!HHHHHH", message[:DNS_HEADER_BYTES])
+    return _HEADER.unpack_from(message, 0)
 
 
 def _decode_question(message, start_offset):
     labels, offset = _decode_name(message, start_offset)
     if offset + 4 > len(message):
         raise DnsParseError("truncated DNS question")
-    qtype, qclass = struct.unpack("!HH", message[offset : offset + 4])
+    qtype, qclass = _TYPE_CLASS.unpack_from(message, offset)
     return (
         {
             "qname_labels": labels,
@@ -143,29 +151,23 @@ def parse_request(message):
         "raw_question_bytes": raw_question_bytes,
     }
     if logger_enabled("trace"):
-        log_event(
-            "trace",
-            "dnswire",
-            {
-                "phase": "server",
-                "classification": "diagnostic",
-                "reason_code": "dns_request_parsed",
-            },
-            context_fn=lambda: {
-                "qdcount": qdcount,
-                "ancount": ancount,
-                "nscount": nscount,
-                "arcount": arcount,
-                "has_question": question is not None,
-            },
-        )
+        log_event("trace", "dnswire", {
+            "phase": "server",
+            "classification": "diagnostic",
+            "reason_code": "dns_request_parsed",
+            "qdcount": qdcount,
+            "ancount": ancount,
+            "nscount": nscount,
+            "arcount": arcount,
+            "has_question": question is not None,
+        })
     return parsed
 
 
 def _pack_pointer(offset):
     if offset < 0 or offset > DNS_POINTER_VALUE_MASK:
         raise ValueError("pointer offset is out of range")
-    return struct.pack("!H", DNS_POINTER_MASK | offset)
+    return _U16.pack(DNS_POINTER_MASK | offset)
 
 
 def _qname_label_offset(question_labels, label_index, qname_offset):
@@ -182,28 +184,29 @@ def encode_name_with_pointer(prefix_labels, pointer_offset):
 
 
 def build_cname_answer(question_labels, domain_label_index, payload_labels, response_label, ttl):
-    owner_name = _pack_pointer(DNS_HEADER_BYTES)
     domain_pointer = _qname_label_offset(
         question_labels, domain_label_index, DNS_HEADER_BYTES
     )
     rdata = encode_name_with_pointer(
-        tuple(payload_labels) + (response_label,),
+        payload_labels + (response_label,),
         domain_pointer,
     )
-    rr_head = struct.pack("!HHIH", DNS_QTYPE_CNAME, DNS_QCLASS_IN, ttl, len(rdata))
-    return owner_name + rr_head + rdata
+    return (
+        _QUESTION_POINTER
+        + _CNAME_TYPE_CLASS
+        + _TTL_RDLENGTH.pack(ttl, len(rdata))
+        + rdata
+    )
 
 
 def build_a_answer(ttl):
-    owner_name = _pack_pointer(DNS_HEADER_BYTES)
-    rr_head = struct.pack("!HHIH", DNS_QTYPE_A, DNS_QCLASS_IN, ttl, len(SYNTHETIC_A_RDATA))
-    return owner_name + rr_head + SYNTHETIC_A_RDATA
+    return _A_ANSWER_PREFIX + _U32.pack(ttl) + _A_ANSWER_SUFFIX
 
 
 def _encode_opt_record(edns_size):
     if edns_size <= 0:
         raise ValueError("edns_size must be positive")
-    return b"\x00" + struct.pack("!HHIH", DNS_QTYPE_OPT, edns_size, 0, 0)
+    return _OPT_PREFIX + _U16.pack(edns_size) + _OPT_SUFFIX
 
 
 def build_response(request, rcode, answer_bytes=None, include_opt=False, edns_size=512):
@@ -220,8 +223,7 @@ def build_response(request, rcode, answer_bytes=None, include_opt=False, edns_si
         | (rcode & 0x000F)
     )
 
-    header = struct.pack(
-        "!HHHHHH",
+    header = _HEADER.pack(
         request["id"],
         flags,
         qdcount,
@@ -230,28 +232,22 @@ def build_response(request, rcode, answer_bytes=None, include_opt=False, edns_si
         arcount,
     )
 
-    parts = [header, raw_question_bytes]
-    if answer_bytes:
-        parts.append(answer_bytes)
-    if include_opt:
-        parts.append(_encode_opt_record(edns_size))
-    response = b"".join(parts)
+    response = b"".join((
+        header,
+        raw_question_bytes,
+        answer_bytes or b"",
+        _encode_opt_record(edns_size) if include_opt else b"",
+    ))
     if logger_enabled("trace"):
-        log_event(
-            "trace",
-            "dnswire",
-            {
-                "phase": "server",
-                "classification": "diagnostic",
-                "reason_code": "dns_response_built",
-            },
-            context_fn=lambda: {
-                "rcode": rcode,
-                "qdcount": qdcount,
-                "ancount": ancount,
-                "arcount": arcount,
-                "include_opt": include_opt,
-                "response_len": len(response),
-            },
-        )
+        log_event("trace", "dnswire", {
+            "phase": "server",
+            "classification": "diagnostic",
+            "reason_code": "dns_response_built",
+            "rcode": rcode,
+            "qdcount": qdcount,
+            "ancount": ancount,
+            "arcount": arcount,
+            "include_opt": include_opt,
+            "response_len": len(response),
+        })
     return response
@@ -6,8 +6,14 @@ import re
 from dnsdle.state import StartupError
 
 
-_EXTRACT_START_RE = re.compile(r"^# __EXTRACT:\s+(\S+)__\s*$")
-_EXTRACT_END_RE = re.compile(r"^# __END_EXTRACT__\s*$")
+# group(1) is the block name for a start marker and None for an end marker.
+# [^\S\n] keeps whitespace matches on the marker line under re.MULTILINE.
+_EXTRACT_MARKER_RE = re.compile(
+    r"^# __(?:EXTRACT:[^\S\n]+(\S+)|END_EXTRACT)__[^\S\n]*$", re.MULTILINE
+)
+
+# module_filename -> {block name: block source}; sources do not change at runtime.
+_BLOCKS_BY_MODULE = {}
 
 
 def _read_module_source(module_filename):
@@ -25,30 +31,30 @@ def _read_module_source(module_filename):
         )
 
 
-def extract_functions(module_filename, names):
+def _module_blocks(module_filename):
+    blocks = _BLOCKS_BY_MODULE.get(module_filename)
+    if blocks is not None:
+        return blocks
+
     source = _read_module_source(module_filename)
-    lines = source.split("\n")
 
     blocks = {}
     current_name = None
-    current_lines = []
+    body_start = 0
 
-    for line in lines:
-        start_match = _EXTRACT_START_RE.match(line)
-        if start_match:
+    for marker in _EXTRACT_MARKER_RE.finditer(source):
+        start_name = marker.group(1)
+        if start_name is not None:
             if current_name is not None:
                 raise StartupError(
                     "startup",
                     "extract_marker_error",
                     "nested extract markers",
-                    {"filename": module_filename, "name": start_match.group(1)},
+                    {"filename": module_filename, "name": start_name},
                 )
-            current_name = start_match.group(1)
-            current_lines = []
-            continue
-
-        end_match = _EXTRACT_END_RE.match(line)
-        if end_match:
+            current_name = start_name
+            body_start = marker.end() + 1
+        else:
             if current_name is None:
                 raise StartupError(
                     "startup",
@@ -56,13 +62,8 @@ def extract_functions(module_filename, names):
                     "end marker without start",
                     {"filename": module_filename},
                 )
-            blocks[current_name] = "\n".join(current_lines)
+            blocks[current_name] = source[body_start:marker.start() - 1]
             current_name = None
-            current_lines = []
-            continue
-
-        if current_name is not None:
-            current_lines.append(line)
 
     if current_name is not None:
         raise StartupError(
@@ -72,6 +73,12 @@ def extract_functions(module_filename, names):
             {"filename": module_filename, "name": current_name},
         )
 
+    _BLOCKS_BY_MODULE[module_filename] = blocks
+    return blocks
+
+
+def extract_functions(module_filename, names):
+    blocks = _module_blocks(module_filename)
     missing = set(names) - set(blocks.keys())
     if missing:
         raise StartupError(
